@@ -36,6 +36,14 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     mongodb_url: str = "mongodb://localhost:27017/"
     mongodb_database: str = "mika_bot"
+    # Connection pool sizing (Per NFR-002: Handle 100+ concurrent requests)
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 10
+    # Wire compression, comma-separated in preference order (e.g. "zstd,snappy,zlib").
+    # Empty disables compression (right for a local MongoDB); worth enabling when the
+    # database is remote, since conversation documents hold repetitive history text.
+    # zstd needs the zstandard package and snappy needs python-snappy; zlib is built in.
+    mongodb_compressors: str = ""
 
     # Temporal Configuration
     temporal_host: str = "localhost"
@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from beanie import Document
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 
 class Conversation(Document):
@@ -133,3 +133,27 @@ class Conversation(Document):
             True if expired, False otherwise.
         """
         return datetime.utcnow() > self.expires_at
+
+
+class ConversationHistory(BaseModel):
+    """
+    Projection of Conversation used for context retrieval.
+
+    Carries only the fields prompts and activities read, so history queries
+    skip the base64 images stored on the full document.
+
+    Attributes:
+        user_id: Reference to User.hashed_user_id.
+        group_id: QQ group ID where message was sent.
+        message: User's message content.
+        response: Bot's response content.
+        timestamp: Message timestamp.
+        expires_at: Auto-deletion date.
+    """
+
+    user_id: str
+    group_id: str
+    message: str
+    response: str
+    timestamp: datetime
+    expires_at: datetime
@@ -10,10 +10,14 @@ fast pre-filtering of obviously inappropriate content, then use LLM
 judgment for ambiguous cases.
 """
 
+import re
 from typing import Optional
 
 from src.config import settings
 
+# Runs of characters outside the CJK Unified Ideographs block (U+4E00-U+9FFF)
+_NON_CHINESE_PATTERN = re.compile("[^\u4e00-\u9fff]+")
+
 
 class ContentFilter:
     """
@@ -76,6 +80,20 @@ class ContentFilter:
             # Add more as needed
         }
 
+        # Performance optimization: Compile each keyword set once into a single
+        # alternation, so a check is one C-level scan of the text instead of a
+        # substring search per keyword. Categories are kept in priority order.
+        self._chinese_checks = self._compile_checks(
+            (self._chinese_keywords_hatred, "contains hatred keywords"),
+            (self._chinese_keywords_politics, "contains political keywords"),
+            (self._chinese_keywords_religion, "contains religious keywords"),
+        )
+        self._english_checks = self._compile_checks(
+            (self._english_keywords_hatred, "contains hatred keywords"),
+            (self._english_keywords_politics, "contains political keywords"),
+            (self._english_keywords_religion, "contains religious keywords"),
+        )
+
     def is_harmful(self, text: str, language: Optional[str] = None) -> tuple[bool, Optional[str]]:
         """
         Check if text contains harmful or inappropriate content.
@@ -97,44 +115,57 @@ class ContentFilter:
         if not text or not text.strip():
             return False, None
 
-        text_lower = text.lower()
-
         # Determine which keyword sets to use
         if language == "zh" or (language is None and self._is_chinese_text(text)):
-            # Check Chinese keywords
-            if self._contains_keywords(text_lower, self._chinese_keywords_hatred):
-                return True, "contains hatred keywords"
-            if self._contains_keywords(text_lower, self._chinese_keywords_politics):
-                return True, "contains political keywords"
-            if self._contains_keywords(text_lower, self._chinese_keywords_religion):
-                return True, "contains religious keywords"
+            checks = self._chinese_checks
         else:
-            # Check English keywords
-            if self._contains_keywords(text_lower, self._english_keywords_hatred):
-                return True, "contains hatred keywords"
-            if self._contains_keywords(text_lower, self._english_keywords_politics):
-                return True, "contains political keywords"
-            if self._contains_keywords(text_lower, self._english_keywords_religion):
-                return True, "contains religious keywords"
+            checks = self._english_checks
+
+        for pattern, reason in checks:
+            if self._contains_keywords(text, pattern):
+                return True, reason
 
         # No harmful content detected
         return False, None
 
-    def _contains_keywords(self, text: str, keywords: set[str]) -> bool:
+    @staticmethod
+    def _compile_checks(
+        *categories: tuple[set[str], str],
+    ) -> tuple[tuple[re.Pattern[str], str], ...]:
+        """
+        Compile keyword sets into (pattern, reason) pairs.
+
+        Args:
+            categories: (keywords, reason) pairs, in the order they are checked.
+
+        Returns:
+            Tuple of (case-insensitive compiled alternation of the keywords,
+            reason), skipping empty keyword sets. Matching ignores case, so
+            the text needs no lowercased copy.
+        """
+        return tuple(
+            (
+                re.compile(
+                    "|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE
+                ),
+                reason,
+            )
+            for keywords, reason in categories
+            if keywords
+        )
+
+    def _contains_keywords(self, text: str, pattern: re.Pattern[str]) -> bool:
         """
-        Check if text contains any of the given keywords.
+        Check if text contains any of the keywords compiled into pattern.
 
         Args:
-            text: Text to search (should be lowercase).
-            keywords: Set of keywords to search for.
+            text: Text to search (any case).
+            pattern: Compiled keyword alternation (see _compile_checks).
 
         Returns:
             True if any keyword found, False otherwise.
         """
-        for keyword in keywords:
-            if keyword.lower() in text:
-                return True
-        return False
+        return pattern.search(text) is not None
 
     def _is_chinese_text(self, text: str) -> bool:
         """
@@ -146,8 +177,9 @@ class ContentFilter:
         Returns:
             True if text appears to be Chinese, False otherwise.
         """
-        # Simple heuristic: check for Chinese characters
-        chinese_chars = sum(1 for char in text if "\u4e00" <= char <= "\u9fff")
+        # Simple heuristic: check for Chinese characters (counted by stripping
+        # everything else in one regex pass rather than a per-character loop)
+        chinese_chars = len(_NON_CHINESE_PATTERN.sub("", text))
         return chinese_chars > len(text) * 0.3  # More than 30% Chinese characters
 
 
@@ -47,12 +47,21 @@ async def init_database() -> None:
 
     # Create MongoDB client
     # Motor (async MongoDB driver) is used by Beanie
+    client_options = {}
+    if settings.mongodb_compressors:
+        # Negotiated with the server; unsupported compressors are skipped
+        client_options["compressors"] = settings.mongodb_compressors
     _client = AsyncIOMotorClient(
         settings.mongodb_url,
         # Connection pool settings for high concurrency
         # Per NFR-002: Handle 100+ concurrent requests
-        maxPoolSize=100,
-        minPoolSize=10,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        # Fail fast instead of stalling when the pool is exhausted or the
+        # server is unreachable
+        waitQueueTimeoutMS=5000,
+        serverSelectionTimeoutMS=5000,
+        **client_options,
     )
 
     # Get database instance
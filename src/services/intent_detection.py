@@ -36,7 +36,7 @@ class IntentDetectionService:
         # Rule-based keyword patterns for common intents
         # Order matters: more specific patterns should be checked first
         # Patterns are checked in order, and the first match wins
-        self._intent_patterns = {
+        intent_patterns = {
             # Song-related intents (check first - more specific)
             "song_query": [
                 r"(?:BPM|bpm|难度|difficulty|节奏|tempo).*?(?:的|of|is|是多少|what)",
@@ -96,7 +96,7 @@ class IntentDetectionService:
 
         # Scenario patterns for context-specific prompts
         # These help select more specific prompt templates based on context
-        self._scenario_patterns = {
+        scenario_patterns = {
             # Song recommendation scenarios
             "song_recommendation_high_bpm": [
                 r"(?:高.*?BPM|high.*?bpm|快.*?节奏|fast.*?tempo|高.*?速度)",
@@ -126,6 +126,20 @@ class IntentDetectionService:
             ],
         }
 
+        # Performance optimization: Compile every pattern once here instead of
+        # going through re's pattern cache on each search. Messages are
+        # lowercased before matching, so patterns are lowercased too and
+        # compiled without re.IGNORECASE (literal matching is faster). Patterns
+        # contain no escapes or case-sensitive classes, so lowering is safe.
+        self._intent_patterns: dict[str, list[re.Pattern[str]]] = {
+            intent: [re.compile(pattern.lower()) for pattern in patterns]
+            for intent, patterns in intent_patterns.items()
+        }
+        self._scenario_patterns: dict[str, list[re.Pattern[str]]] = {
+            scenario: [re.compile(pattern.lower()) for pattern in patterns]
+            for scenario, patterns in scenario_patterns.items()
+        }
+
     async def detect_intent(
         self,
         message: str,
@@ -158,7 +172,7 @@ class IntentDetectionService:
         for intent, patterns in self._intent_patterns.items():
             score = 0
             for pattern in patterns:
-                if re.search(pattern, message_lower, re.IGNORECASE):
+                if pattern.search(message_lower):
                     score += 1
             if score > 0:
                 intent_scores[intent] = score
@@ -230,7 +244,7 @@ class IntentDetectionService:
             
             score = 0
             for pattern in patterns:
-                if re.search(pattern, message_lower, re.IGNORECASE):
+                if pattern.search(message_lower):
                     score += 1
             if score > 0:
                 scenario_scores[scenario] = score
@@ -10,9 +10,9 @@ Per FR-005: System MUST store and retrieve user conversation history
 and preferences to enable contextual responses.
 """
 
-from typing import Optional
+from typing import Optional, Union
 
-from src.models.conversation import Conversation
+from src.models.conversation import Conversation, ConversationHistory
 from src.models.impression import Impression
 from src.models.user import User
 
@@ -28,7 +28,7 @@ class UserContext:
         self,
         user: Optional[User] = None,
         impression: Optional[Impression] = None,
-        recent_conversations: Optional[list[Conversation]] = None,
+        recent_conversations: Optional[list[Union[Conversation, ConversationHistory]]] = None,
     ) -> None:
         """
         Initialize user context.
@@ -133,10 +133,13 @@ async def retrieve_context(hashed_user_id: str) -> UserContext:
     
     # Order by timestamp descending (most recent first)
     # Use string notation for sort when using dictionary query
+    # Served by the (user_id, timestamp) compound index; the projection skips
+    # stored images, which can be megabytes of base64 per conversation
     recent_conversations = (
         await Conversation.find({"user_id": hashed_user_id})
         .sort("-timestamp")  # Descending order (most recent first)
         .limit(limit)  # Configurable limit (default: 10)
+        .project(ConversationHistory)
         .to_list()
     )
 
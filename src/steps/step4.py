@@ -16,7 +16,7 @@ from typing import Optional
 import structlog
 
 from src.config import get_bot_name
-from src.prompts import get_prompt_manager
+from src.prompts import UseCase, get_prompt_manager
 from src.services.llm import get_llm_service
 from src.services.meme_search import detect_meme_keywords, get_meme_definition, search_and_store_meme
 from src.steps.step2 import UserContext
@@ -326,7 +326,7 @@ Respond as {bot_name} naturally and diversely:
                         if use_random_variant:
                             try:
                                 template_name, prompt = prompt_manager.get_random_prompt_by_use_case(
-                                    use_case="memory_aware",
+                                    use_case=UseCase.MEMORY_AWARE,
                                     bot_name=bot_name,
                                     language=parsed_input.language,
                                     user_message=parsed_input.message,
@@ -339,7 +339,7 @@ Respond as {bot_name} naturally and diversely:
                                 logger.debug(
                                     "random_variant_selected",
                                     template_name=template_name,
-                                    use_case="memory_aware",
+                                    use_case=UseCase.MEMORY_AWARE,
                                 )
                             except (ValueError, KeyError):
                                 # Fallback to default memory_aware if random variant fails
@@ -25,6 +25,14 @@ from src.config import settings
 from src.workflows.message_workflow import ProcessMessageWorkflow
 from src.workflows.cleanup_workflow import CleanupConversationsWorkflow
 
+# Optional: uvloop event loop (installed with uvicorn[standard] on non-Windows platforms)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None  # type: ignore
+
 logger = structlog.get_logger()
 
 
@@ -131,10 +139,12 @@ def main() -> None:
     """
     Main entry point for Temporal worker.
 
-    Runs the worker in an async event loop.
+    Runs the worker in an async event loop, using uvloop when available
+    (the same loop uvicorn picks for the API server).
     """
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
     try:
-        asyncio.run(run_worker())
+        asyncio.run(run_worker(), loop_factory=loop_factory)
     except KeyboardInterrupt:
         print("\nWorker stopped by user")
     except Exception as e:
@@ -15,6 +15,7 @@ from src.activities.step2_activity import step2_retrieve_context_activity
 from src.activities.step3_activity import step3_query_song_activity
 from src.activities.step4_activity import step4_invoke_llm_activity
 from src.activities.step5_activity import step5_update_impression_activity
+from src.models.conversation import ConversationHistory
 from tests.fixtures.mock_songs import get_mock_song
 
 
@@ -72,7 +73,7 @@ class TestStep2Activity:
         with patch("src.steps.step2.User.find_one", new_callable=AsyncMock, return_value=None):
             with patch("src.steps.step2.Impression.find_one", new_callable=AsyncMock, return_value=None):
                 with patch("src.steps.step2.Conversation.find") as mock_find:
-                    mock_find.return_value.sort.return_value.limit.return_value.to_list = (
+                    mock_find.return_value.sort.return_value.limit.return_value.project.return_value.to_list = (
                         AsyncMock(return_value=[])
                     )
 
@@ -82,6 +83,9 @@ class TestStep2Activity:
                     assert result["user"] is None
                     assert result["impression"] is None
                     assert result["recent_conversations"] == []
+                    mock_find.return_value.sort.return_value.limit.return_value.project.assert_called_once_with(
+                        ConversationHistory
+                    )
 
     @pytest.mark.asyncio
     async def test_retrieve_context_existing_user(self) -> None:
@@ -109,7 +113,7 @@ class TestStep2Activity:
         with patch("src.steps.step2.User.find_one", new_callable=AsyncMock, return_value=mock_user):
             with patch("src.steps.step2.Impression.find_one", new_callable=AsyncMock, return_value=mock_impression):
                 with patch("src.steps.step2.Conversation.find") as mock_find:
-                    mock_find.return_value.sort.return_value.limit.return_value.to_list = (
+                    mock_find.return_value.sort.return_value.limit.return_value.project.return_value.to_list = (
                         AsyncMock(return_value=[])
                     )
 
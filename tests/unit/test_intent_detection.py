@@ -73,6 +73,17 @@ class TestIntentDetectionService:
         intent = await service.detect_intent("Mika, what is the BPM of 千本桜?")
         assert intent == "song_query"
 
+    @pytest.mark.asyncio
+    async def test_detect_intent_case_insensitive(self) -> None:
+        """Test that intent patterns match regardless of message case."""
+        service = IntentDetectionService()
+
+        intent = await service.detect_intent("MIKA, WHAT IS THE BPM OF 千本桜?")
+        assert intent == "song_query"
+
+        intent = await service.detect_intent("Mika, RECOMMEND some SONGS")
+        assert intent == "song_recommendation"
+
     @pytest.mark.asyncio
     async def test_detect_intent_song_recommendation(self) -> None:
         """Test detecting song recommendation intent."""
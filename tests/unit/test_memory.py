@@ -14,7 +14,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.models.conversation import Conversation
+from src.models.conversation import Conversation, ConversationHistory
 from src.models.impression import Impression
 from src.models.user import User
 from src.steps.step1 import ParsedInput
@@ -139,7 +139,7 @@ class TestContextRetrieval:
             
             mock_user.return_value = None
             mock_impression.return_value = None
-            mock_conversation.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[])
+            mock_conversation.return_value.sort.return_value.limit.return_value.project.return_value.to_list = AsyncMock(return_value=[])
             
             context = await retrieve_context(hashed_user_id)
             
@@ -147,6 +147,9 @@ class TestContextRetrieval:
             assert context.user is None
             assert context.impression is None
             assert context.recent_conversations == []
+            mock_conversation.return_value.sort.return_value.limit.return_value.project.assert_called_once_with(
+                ConversationHistory
+            )
 
     @pytest.mark.asyncio
     async def test_retrieve_context_existing_user(self) -> None:
@@ -192,7 +195,7 @@ class TestContextRetrieval:
             
             # Mock conversation query chain
             mock_query = MagicMock()
-            mock_query.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=mock_conversations)
+            mock_query.sort.return_value.limit.return_value.project.return_value.to_list = AsyncMock(return_value=mock_conversations)
             mock_conversation_find.return_value = mock_query
             
             context = await retrieve_context(hashed_user_id)
@@ -232,7 +235,7 @@ class TestContextRetrieval:
             
             # Mock conversation query chain
             mock_query = MagicMock()
-            mock_query.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=mock_conversations[:5])
+            mock_query.sort.return_value.limit.return_value.project.return_value.to_list = AsyncMock(return_value=mock_conversations[:5])
             mock_conversation_find.return_value = mock_query
             
             context = await retrieve_context(hashed_user_id)
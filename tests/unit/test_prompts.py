@@ -0,0 +1,586 @@
+"""
+Prompt template system tests.
+
+Tests PromptTemplate metadata and PromptManager registration, rendering,
+versioning, and A/B testing behavior.
+
+Per FR-013: Structured prompt template system.
+"""
+
+import threading
+import time
+from datetime import timezone
+
+import pytest
+
+from src.prompts import PromptManager, PromptTemplate, UseCase, get_prompt_manager
+
+
+class TestPromptTemplate:
+    """Test cases for PromptTemplate metadata."""
+
+    def test_timestamps_are_integer_nanoseconds(self):
+        """Timestamps should be stored as integer nanoseconds."""
+        template = PromptTemplate(
+            name="greeting",
+            template="Hello {name}!",
+            use_case="general_chat",
+            variables=["name"],
+        )
+
+        assert isinstance(template.created_at_ns, int)
+        assert isinstance(template.updated_at_ns, int)
+
+    def test_created_at_is_utc_datetime(self):
+        """created_at should expose a timezone-aware UTC datetime."""
+        template = PromptTemplate(
+            name="greeting",
+            template="Hello {name}!",
+            use_case="general_chat",
+            variables=["name"],
+        )
+
+        assert template.created_at.tzinfo is timezone.utc
+        assert int(template.created_at.timestamp()) == template.created_at_ns // 10**9
+
+    def test_template_is_frozen_and_hashable(self):
+        """Templates should be immutable and usable as dict keys."""
+        template = PromptTemplate(
+            name="greeting",
+            template="Hello {name}!",
+            use_case="general_chat",
+            variables=["name"],
+        )
+
+        assert template.variables == ("name",)
+        assert {template: "cached"}[template] == "cached"
+        with pytest.raises(AttributeError):
+            template.template = "Bye {name}!"
+
+    def test_content_hash_depends_only_on_text(self):
+        """Templates with the same text should share a content hash."""
+        first = PromptTemplate("a", "Hello {name}!", "general_chat", ["name"])
+        same_text = PromptTemplate("b", "Hello {name}!", "song_query", ["name"], version="2.0")
+        other = PromptTemplate("a", "Bye {name}!", "general_chat", ["name"])
+
+        assert first.content_hash == same_text.content_hash
+        assert first.content_hash != other.content_hash
+        assert len(first.content_hash) == 32
+
+
+class TestPromptManager:
+    """Test cases for PromptManager registration and rendering."""
+
+    def test_get_prompt_renders_variables(self):
+        """Registered prompt should render with provided variables."""
+        manager = PromptManager()
+        manager.add_prompt("greeting", "Hello {bot_name}!", "general_chat")
+
+        assert manager.get_prompt("greeting", bot_name="Mika") == "Hello Mika!"
+
+    def test_version_history_ordered_by_creation(self):
+        """Version history should be ordered oldest first."""
+        manager = PromptManager()
+        manager.add_prompt("test", "A", "general_chat", version="1.0")
+        manager.add_prompt("test", "B", "general_chat", version="2.0")
+
+        history = manager.get_version_history("test")
+        assert [t.version for t in history] == ["1.0", "2.0"]
+        assert history[0].created_at_ns <= history[1].created_at_ns
+
+    def test_version_history_snapshot_refreshed_on_add(self):
+        """History should be an immutable snapshot that reflects later adds."""
+        manager = PromptManager()
+        manager.add_prompt("test", "A", "general_chat", version="1.0")
+
+        history = manager.get_version_history("test")
+        assert isinstance(history, tuple)
+        assert manager.get_version_history("test") is history
+
+        manager.add_prompt("test", "B", "general_chat", version="2.0")
+        assert len(history) == 1
+        assert [t.version for t in manager.get_version_history("test")] == ["1.0", "2.0"]
+
+    def test_latest_version_compares_numerically(self):
+        """Latest version should use numeric ordering ("10.0" after "2.0")."""
+        manager = PromptManager()
+        manager.add_prompt("test", "ten", "general_chat", version="10.0")
+        manager.add_prompt("test", "two", "general_chat", version="2.0")
+
+        assert manager.get_prompt("test") == "ten"
+        assert manager.get_prompt("test", version="2.0") == "two"
+        assert manager.list_versions("test") == ("10.0", "2.0")
+
+        with pytest.raises(ValueError, match="3.0"):
+            manager.get_prompt("test", version="3.0")
+
+    def test_readding_version_replaces_latest(self):
+        """Re-adding an existing version should replace it for default lookups."""
+        manager = PromptManager()
+        manager.add_prompt("test", "old", "general_chat", version="1.0")
+        manager.add_prompt("test", "new", "general_chat", version="1.0")
+
+        assert manager.get_prompt("test") == "new"
+        assert manager.list_versions("test") == ("1.0",)
+
+    def test_list_prompts_filters_by_use_case(self):
+        """list_prompts should follow use case changes when a version is replaced."""
+        manager = PromptManager()
+        manager.add_prompt("chat1", "A", "general_chat")
+        manager.add_prompt("song1", "B", "song_query")
+        manager.add_prompt("chat2", "C", "general_chat")
+
+        assert manager.list_prompts(use_case="general_chat") == ["chat1", "chat2"]
+        assert manager.list_prompts(use_case="image_analysis") == []
+
+        manager.add_prompt("chat2", "D", "song_query")
+        assert manager.list_prompts(use_case="general_chat") == ["chat1"]
+        assert manager.list_prompts(use_case="song_query") == ["song1", "chat2"]
+
+    def test_templates_by_use_case_skip_missing_variables(self):
+        """Templates needing variables that were not passed should be left out."""
+        manager = PromptManager()
+        manager.add_prompt("chat1", "Hi {bot_name}!", "general_chat")
+        manager.add_prompt("chat2", "Hi {bot_name}, {user_message}", "general_chat")
+        manager.add_prompt("song1", "{bot_name} likes {song_name}", "song_query")
+
+        assert manager.get_templates_by_use_case("general_chat", bot_name="Mika") == [
+            ("chat1", "Hi Mika!")
+        ]
+        assert manager.get_random_prompt_by_use_case("general_chat", bot_name="Mika") == (
+            "chat1",
+            "Hi Mika!",
+        )
+        with pytest.raises(ValueError, match="song_query"):
+            manager.get_random_prompt_by_use_case("song_query", bot_name="Mika")
+
+    def test_render_cache_invalidated_on_add(self):
+        """Cached renders should not survive registering a newer version."""
+        manager = PromptManager()
+        manager.add_prompt("greeting", "Hello {bot_name}!", "general_chat", version="1.0")
+        assert manager.get_prompt("greeting", bot_name="Mika") == "Hello Mika!"
+        assert manager.get_prompt("greeting", bot_name="Mika") == "Hello Mika!"
+
+        manager.add_prompt("greeting", "Hi {bot_name}!", "general_chat", version="2.0")
+        assert manager.get_prompt("greeting", bot_name="Mika") == "Hi Mika!"
+
+    def test_unhashable_variables_render_uncached(self):
+        """Unhashable variable values should still render."""
+        manager = PromptManager()
+        manager.add_prompt("prefs", "Likes: {user_preferences}", "general_chat")
+
+        assert manager.get_prompt(
+            "prefs", user_preferences=["千本桜"]
+        ) == "Likes: ['千本桜']"
+
+    def test_render_cache_skips_long_values(self):
+        """Repeated short renders should hit the cache; long histories should bypass it."""
+        manager = PromptManager()
+        manager.add_prompt("chat", "{bot_name}: {conversation_history}", "general_chat")
+
+        manager.get_prompt("chat", bot_name="Mika", conversation_history="")
+        manager.get_prompt("chat", bot_name="Mika", conversation_history="")
+        history = "Don! " * 200
+        assert manager.get_prompt(
+            "chat", bot_name="Mika", conversation_history=history
+        ) == f"Mika: {history}"
+
+        info = manager.render_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_render_cache_distinguishes_equal_values_of_different_types(self):
+        """Values that compare equal but render differently should not share a cache entry."""
+        manager = PromptManager()
+        manager.add_prompt("x", "v={n}", "general_chat")
+
+        assert manager.get_prompt("x", n=1) == "v=1"
+        assert manager.get_prompt("x", n=True) == "v=True"
+        assert manager.get_prompt("x", n=1.0) == "v=1.0"
+        assert manager.get_prompt("x", n=1) == "v=1"
+
+    def test_use_case_strings_normalized_to_enum(self):
+        """Known use case names should be stored as UseCase members."""
+        manager = PromptManager()
+        manager.add_prompt("song1", "A", "song_query")
+
+        template = manager.get_version_history("song1")[0]
+        assert template.use_case is UseCase.SONG_QUERY
+        assert template.use_case == "song_query"
+        assert manager.list_prompts(use_case=UseCase.SONG_QUERY) == ["song1"]
+        assert manager.list_prompts(use_case="song_query") == ["song1"]
+
+    def test_bulk_add_registers_all_or_nothing(self):
+        """bulk_add should register every spec, or none if one is invalid."""
+        manager = PromptManager()
+        manager.bulk_add((
+            {"name": "chat", "template": "A {bot_name}", "use_case": "general_chat"},
+            {"name": "chat", "template": "B {bot_name}", "use_case": "general_chat", "version": "2.0"},
+            {"name": "song", "template": "{song_name}", "use_case": "song_query"},
+        ))
+
+        assert manager.get_prompt("chat", bot_name="Mika") == "B Mika"
+        assert [t.version for t in manager.get_version_history("chat")] == ["1.0", "2.0"]
+        assert manager.list_prompts(use_case="song_query") == ["song"]
+
+        with pytest.raises(ValueError, match="missing_partial"):
+            manager.bulk_add((
+                {"name": "ok", "template": "fine", "use_case": "general_chat"},
+                {"name": "bad", "template": "{{> missing_partial}}", "use_case": "general_chat"},
+            ))
+        assert "ok" not in manager.list_prompts()
+
+    def test_loader_runs_once_on_first_access(self):
+        """Deferred loaders should run once, only when their prompts are needed."""
+        manager = PromptManager()
+        calls = []
+
+        def load_songs():
+            calls.append("songs")
+            manager.add_prompt("song", "{song_name}", "song_query")
+
+        manager.add_prompt("chat", "Hi", "general_chat")
+        manager.register_loader(load_songs, [UseCase.SONG_QUERY])
+
+        assert manager.get_prompt("chat") == "Hi"
+        assert manager.list_prompts(use_case="general_chat") == ["chat"]
+        assert calls == []
+
+        assert manager.get_prompt("song", song_name="Senbonzakura") == "Senbonzakura"
+        assert manager.list_prompts(use_case="song_query") == ["song"]
+        assert calls == ["songs"]
+
+    def test_named_loader_runs_only_for_its_prompts(self):
+        """A lookup miss should only run loaders declaring that prompt name."""
+        manager = PromptManager()
+        calls = []
+
+        def loader(name):
+            def load():
+                calls.append(name)
+                manager.add_prompt(name, name, "general_chat")
+            return load
+
+        manager.register_loader(loader("greeting"), ["general_chat"], ["greeting"])
+        manager.register_loader(loader("help"), ["general_chat"], ["help"])
+
+        assert manager.get_prompt("help") == "help"
+        assert calls == ["help"]
+
+        with pytest.raises(ValueError):
+            manager.get_prompt("unknown")
+        assert calls == ["help"]
+
+    def test_ab_test_setup_runs_pending_loader(self):
+        """A/B setup on a deferred prompt should load it first."""
+        manager = PromptManager()
+        manager.register_loader(
+            lambda: manager.add_prompt("memory", "A", "memory_aware"),
+            ["memory_aware"],
+            ["memory"],
+        )
+
+        manager.setup_ab_test("memory", "1.0", "1.0")
+        assert manager.get_ab_test_status("memory")["variant_a"] == "1.0"
+
+    def test_concurrent_lookup_waits_for_running_loader(self):
+        """A lookup racing a running loader should wait for it, not report a miss."""
+        manager = PromptManager()
+        started = threading.Event()
+
+        def load_songs():
+            started.set()
+            time.sleep(0.2)
+            manager.add_prompt("song", "{song_name}", "song_query")
+
+        manager.register_loader(load_songs, ["song_query"], ["song"])
+        results = []
+
+        def lookup():
+            results.append(manager.get_prompt("song", song_name="x"))
+
+        first = threading.Thread(target=lookup)
+        first.start()
+        started.wait()
+        second = threading.Thread(target=lookup)
+        second.start()
+        first.join()
+        second.join()
+
+        assert results == ["x", "x"]
+
+    def test_loader_may_look_up_other_deferred_prompts(self):
+        """A loader that looks up another deferred prompt should not deadlock."""
+        manager = PromptManager()
+        manager.register_loader(
+            lambda: manager.add_prompt("base", "Don!", "general_chat"), ["general_chat"], ["base"]
+        )
+        manager.register_loader(
+            lambda: manager.add_prompt(
+                "combo", manager.get_prompt("base") + " Katsu!", "general_chat"
+            ),
+            ["general_chat"],
+            ["combo"],
+        )
+
+        assert manager.get_prompt("combo") == "Don! Katsu!"
+
+    def test_adding_version_runs_pending_loader(self):
+        """Adding a version of a deferred prompt should keep its loaded versions."""
+        manager = PromptManager()
+        manager.register_loader(
+            lambda: manager.add_prompt("memory", "A", "memory_aware"),
+            ["memory_aware"],
+            ["memory"],
+        )
+        manager.register_loader(
+            lambda: manager.add_prompt("other", "C", "general_chat"), ["general_chat"]
+        )
+
+        manager.add_prompt("memory", "B", "memory_aware", version="2.0")
+        assert manager.list_versions("memory") == ("2.0", "1.0")
+        manager.setup_ab_test("memory", "1.0", "2.0")
+        assert manager.list_prompts(use_case="general_chat") == ["other"]
+
+    def test_missing_variables_reported_together(self):
+        """All missing variables should be reported in a single ValueError."""
+        manager = PromptManager()
+        manager.add_prompt("chat", "{bot_name} hears {user_message}", "general_chat")
+
+        with pytest.raises(ValueError) as exc_info:
+            manager.get_prompt("chat")
+
+        assert "bot_name" in str(exc_info.value)
+        assert "user_message" in str(exc_info.value)
+
+    def test_undeclared_template_field_is_required(self):
+        """Fields missing from the declared variables should still be validated."""
+        manager = PromptManager()
+        manager.add_prompt(
+            "chat",
+            "{bot_name} hears {user_message}",
+            "general_chat",
+            variables=["bot_name"],
+        )
+
+        with pytest.raises(ValueError, match="user_message"):
+            manager.get_prompt("chat", bot_name="Mika")
+
+    def test_partial_binds_fixed_variables(self):
+        """partial() should bake fixed variables in and keep the rest."""
+        manager = PromptManager()
+        manager.add_prompt(
+            "chat",
+            "{bot_name} ({language}) {{hi}}: {user_message}",
+            "general_chat",
+        )
+
+        chat = manager.partial("chat", bot_name="Mika", language="zh")
+
+        assert chat.variables == ("user_message",)
+        assert chat.render({"user_message": "Don!"}) == "Mika (zh) {hi}: Don!"
+        # Registry is unchanged
+        assert manager.get_prompt(
+            "chat", bot_name="A", language="en", user_message="x"
+        ) == "A (en) {hi}: x"
+
+    def test_partial_escapes_braces_in_fixed_values(self):
+        """Braces inside bound values should not become new fields."""
+        manager = PromptManager()
+        manager.add_prompt("chat", "{bot_name}: {user_message}", "general_chat")
+
+        chat = manager.partial("chat", bot_name="{Mika}")
+
+        assert chat.render({"user_message": "Katsu!"}) == "{Mika}: Katsu!"
+
+    def test_render_matches_str_format(self):
+        """Compiled renderer should match str.format, including format specs."""
+        template = (
+            "{{literal}} {bot_name} {bpm:>5} {score:.1f} 'quoted' \\ {bot_name}"
+            " {bpm:'^9} {bpm:\\>7} {bot_name!r} {{ﾟ∀ﾟ}}"
+        )
+        manager = PromptManager()
+        manager.add_prompt("fmt", template, "song_query")
+
+        kwargs = {"bot_name": "Mika", "bpm": 200, "score": 98.76}
+        assert manager.get_prompt("fmt", **kwargs) == template.format(**kwargs)
+
+    def test_static_template_renders_unescaped_text(self):
+        """Templates without fields should render their literal text, braces unescaped."""
+        manager = PromptManager()
+        manager.add_prompt("static", "Don! {{Katsu!}} 🥁", "general_chat")
+
+        assert manager.get_prompt("static") == "Don! {Katsu!} 🥁"
+        assert manager.get_prompt("static", bot_name="Mika") == "Don! {Katsu!} 🥁"
+        template = manager.get_version_history("static")[0]
+        assert template.render_bytes({}) == "Don! {Katsu!} 🥁".encode("utf-8")
+
+    def test_attribute_field_lookup_failure_raises_value_error(self):
+        """Lookup failures inside the renderer should surface as ValueError."""
+        template = PromptTemplate(
+            name="song",
+            template="{song.title} by {song.artist}",
+            use_case="song_query",
+            variables=[],
+        )
+
+        with pytest.raises(ValueError, match="song"):
+            template.render({})
+
+    def test_render_bytes_matches_encoded_render(self):
+        """render_bytes should equal the UTF-8 encoding of render."""
+        template = PromptTemplate(
+            name="song",
+            template="🥁 {song_name} 🎶 BPM {bpm:>4}",
+            use_case="song_query",
+            variables=["song_name", "bpm"],
+        )
+
+        kwargs = {"song_name": "千本桜", "bpm": 200}
+        assert template.render_bytes(kwargs) == template.render(kwargs).encode("utf-8")
+
+        with pytest.raises(ValueError, match="bpm"):
+            template.render_bytes({"song_name": "千本桜"})
+
+    def test_extract_variables_uses_format_parser(self):
+        """Variable extraction should match str.format field parsing."""
+        manager = PromptManager()
+        manager.add_prompt(
+            "song",
+            "{{escaped}} {song.title} {song[bpm]} {bot_name!r} {score:>{width}}",
+            "song_query",
+        )
+
+        template = manager.get_version_history("song")[0]
+        assert template.variables == ("song", "bot_name", "score", "width")
+
+    def test_unknown_engine_rejected(self):
+        """Unknown template engines should raise ValueError."""
+        manager = PromptManager()
+
+        with pytest.raises(ValueError, match="engine"):
+            manager.add_prompt("chat", "{bot_name}", "general_chat", engine="mustache")
+
+    def test_jinja2_engine_renders_conditionals(self):
+        """jinja2 prompts should support conditional blocks."""
+        pytest.importorskip("jinja2")
+        manager = PromptManager()
+        manager.add_prompt(
+            "song",
+            "{{ song_name }}{% if fallback_notice %} ({{ fallback_notice }}){% endif %}",
+            "song_query",
+            engine="jinja2",
+        )
+
+        # Variables used only inside {% if %} are optional
+        assert manager.get_prompt("song", song_name="千本桜") == "千本桜"
+        assert manager.get_prompt(
+            "song", song_name="千本桜", fallback_notice="cached"
+        ) == "千本桜 (cached)"
+
+    def test_jinja2_engine_requires_declared_variables(self):
+        """Explicitly declared jinja2 variables should still be required."""
+        pytest.importorskip("jinja2")
+        manager = PromptManager()
+        manager.add_prompt(
+            "song",
+            "{{ song_name }}{% if fallback_notice %} ({{ fallback_notice }}){% endif %}",
+            "song_query",
+            variables=["song_name"],
+            engine="jinja2",
+        )
+
+        with pytest.raises(ValueError, match="song_name"):
+            manager.get_prompt("song")
+
+    def test_partials_expanded_at_registration(self):
+        """{{> name}} tokens should be replaced by registered partials."""
+        manager = PromptManager()
+        manager.register_partial("intro", "You are {bot_name}!")
+        manager.add_prompt("greet", "{{> intro}}\n{user_message}", "general_chat")
+
+        template = manager.get_version_history("greet")[0]
+        assert template.template == "You are {bot_name}!\n{user_message}"
+        assert template.variables == ("bot_name", "user_message")
+        assert manager.get_prompt(
+            "greet", bot_name="Mika", user_message="Don!"
+        ) == "You are Mika!\nDon!"
+
+    def test_unknown_partial_rejected(self):
+        """Referencing an unregistered partial should raise ValueError."""
+        manager = PromptManager()
+
+        with pytest.raises(ValueError, match="missing_partial"):
+            manager.add_prompt("greet", "{{> missing_partial}}", "general_chat")
+
+    def test_find_duplicate_templates(self):
+        """Identical template text under different names should be reported."""
+        manager = PromptManager()
+        manager.add_prompt("chat1", "Hi {bot_name}!", "general_chat")
+        manager.add_prompt("chat2", "Hi {bot_name}!", "general_chat")
+        manager.add_prompt("chat3", "Yo {bot_name}!", "general_chat")
+
+        assert manager.find_duplicate_templates() == [(("chat1", "1.0"), ("chat2", "1.0"))]
+
+    def test_ab_test_assignment_is_consistent(self):
+        """The same user hash should always get the same variant."""
+        manager = PromptManager()
+        manager.add_prompt("test", "A", "general_chat", version="1.0")
+        manager.add_prompt("test", "B", "general_chat", version="2.0")
+        manager.setup_ab_test("test", "1.0", "2.0", traffic_split=0.5)
+
+        first = manager.get_prompt_with_ab_test("test", user_id_hash="abc123")
+        for _ in range(5):
+            assert manager.get_prompt_with_ab_test("test", user_id_hash="abc123") == first
+
+        manager.setup_ab_test("test", "1.0", "2.0", traffic_split=1.0)
+        assert manager.get_prompt_with_ab_test("test", user_id_hash="abc123") == "A"
+        manager.setup_ab_test("test", "1.0", "2.0", traffic_split=0.0)
+        assert manager.get_prompt_with_ab_test("test", user_id_hash="abc123") == "B"
+
+    def test_ab_test_status_reports_configuration(self):
+        """get_ab_test_status should return the configured variants and split."""
+        manager = PromptManager()
+        manager.add_prompt("test", "A", "general_chat", version="1.0")
+        manager.add_prompt("test", "B", "general_chat", version="2.0")
+
+        assert manager.get_ab_test_status("test") is None
+        manager.setup_ab_test("test", "1.0", "2.0", traffic_split=0.25)
+        assert manager.get_ab_test_status("test") == {
+            "variant_a": "1.0",
+            "variant_b": "2.0",
+            "traffic_split": 0.25,
+        }
+
+
+class TestDefaultPrompts:
+    """Test cases for the default prompt templates."""
+
+    def test_per_request_fields_follow_static_instructions(self):
+        """Per-request fields should come after the instructions so the prefix stays cacheable."""
+        manager = get_prompt_manager()
+        for name in manager.list_prompts():
+            template = manager.get_version_history(name)[-1]
+            values = {var: "\x00" for var in template.variables}
+            values.update(bot_name="Mika", language="zh-CN")
+            rendered = manager.get_prompt(name, **values)
+
+            assert rendered.index("Respond as Mika") < rendered.index("\x00"), name
+
+    def test_song_query_renders_with_step4_kwargs(self):
+        """song_query should render with exactly the variables step4 passes."""
+        manager = get_prompt_manager()
+        rendered = manager.get_prompt(
+            "song_query",
+            bot_name="Mika",
+            song_name="千本桜",
+            bpm=154,
+            difficulty_stars=10,
+            real_difficulty_text="",
+            metadata_text="",
+            user_message="Mika, 千本桜的BPM是多少？",
+            language="zh",
+            fallback_notice="",
+        )
+
+        assert "Song Name: 千本桜" in rendered
+        assert "这首真实难度{real_difficulty}呢" in rendered